@@ -5,34 +5,107 @@ Analyzes both raw and cleaned Sindhi text with Unicode safety.
 """
 
 import re
-import pandas as pd
-import matplotlib.pyplot as plt
+import csv
+import argparse
+import functools
+import glob
+from concurrent.futures import ProcessPoolExecutor
 from collections import Counter
-from wordcloud import WordCloud
 import arabic_reshaper
 from bidi.algorithm import get_display
 import unicodedata
+import hashlib
+import mmap
 import os
+import pickle
 import sys
 
 # Add the parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Sindhi/Arabic Unicode ranges (incl. presentation forms)
+SINDHI_RANGES = r'\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF'
+
+# Characters that make up a word in the statistics. This is the class the original
+# r'[' + self.sindhi_chars[2:-1] + r']+' pattern produced: slicing off "[\" turned
+# the first range into "u0600-\u06FF", i.e. '0' (U+0030) up to U+06FF, so digits,
+# Latin letters and ۔ ؟ also join words. Kept as is so the reported statistics don't move.
+SINDHI_WORD_CHARS = r'0-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF'
+
+# Compiled once at import: runs of two or more word characters. The {2,}
+# quantifier drops single characters inside the regex engine itself.
+SINDHI_WORD_RE = re.compile(r'[' + SINDHI_WORD_CHARS + r']{2,}')
+
+# Sindhi sentence boundaries: ۔ (Arabic full stop), ؟ (Arabic question mark), !
+SENTENCE_SPLIT_RE = re.compile(r'[۔؟!]+')
+
+# Part of every cache key; bump when tokenization or the cached data format changes
+CACHE_VERSION = 1
+
+def _load_pickle(path):
+    """Return the object pickled at path, or None if it is missing or unreadable."""
+    try:
+        with open(path, 'rb') as file:
+            return pickle.load(file)
+    except Exception:
+        # A truncated or incompatible cache file is treated as a cache miss
+        return None
+
+def _dump_pickle(obj, path, stale_pattern=None):
+    """Pickle obj to path through a temporary file, so readers never see a partial write.
+    
+    Caching is best effort: if the file cannot be written the run carries on
+    uncached. After a successful write, other files matching stale_pattern
+    (older entries for the same input) are removed.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'wb') as file:
+            pickle.dump(obj, file, protocol=5)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Warning: could not write cache file {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+    if stale_pattern:
+        for stale in glob.glob(stale_pattern):
+            if stale != path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+@functools.lru_cache(maxsize=4096)
+def _reshape_rtl(text):
+    """Reshape and reorder Arabic-script text; cached since the same top words are plotted repeatedly."""
+    return get_display(arabic_reshaper.reshape(text))
+
 class SindhiCorpusAnalyzer:
     """Analyzer for Sindhi text corpora with RTL and Unicode support."""
     
-    def __init__(self, output_dir="processed/analysis_outputs"):
+    def __init__(self, output_dir="processed/analysis_outputs", cache_dir=None, dpi=150):
         self.output_dir = output_dir
+        # Resolution for saved figures; PNG rasterization time grows with dpi squared
+        self.dpi = dpi
+        # Cached word counts live next to the outputs, e.g. processed/.cache
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(output_dir), '.cache')
         self.ensure_output_dir()
         
-        # Sindhi/Arabic Unicode ranges
-        self.sindhi_chars = r'[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\uFB50-\uFDFF\uFE70-\uFEFF]'
+        # Sindhi/Arabic Unicode ranges (the compiled patterns live at module level)
+        self.sindhi_chars = r'[' + SINDHI_RANGES + r']'
         self.sindhi_punctuation = r'[۔؟!]'
         
-        # Configure matplotlib for RTL text
+    def _pyplot(self):
+        """Import matplotlib on first use (stats-only runs never pay for it) and configure it for RTL text."""
+        import matplotlib.pyplot as plt
         plt.rcParams['font.family'] = 'DejaVu Sans'
         plt.rcParams['axes.unicode_minus'] = False
-        
+        return plt
+    
     def ensure_output_dir(self):
         """Create output directory if it doesn't exist."""
         os.makedirs(self.output_dir, exist_ok=True)
@@ -43,15 +116,30 @@ class SindhiCorpusAnalyzer:
     
     def prepare_rtl_text(self, text):
         """Prepare RTL text for visualization."""
-        # Reshape Arabic script for proper display
-        reshaped_text = arabic_reshaper.reshape(text)
-        return get_display(reshaped_text)
+        # Reshape Arabic script for proper display (memoized per string)
+        return _reshape_rtl(text)
+    
+    def rtl_label(self, word, rtl_labels=None):
+        """Return the display form of word, taken from precomputed rtl_labels when available."""
+        if rtl_labels and word in rtl_labels:
+            return rtl_labels[word]
+        return self.prepare_rtl_text(word)
+    
+    def _read_corpus(self, file_path):
+        """Read a UTF-8 corpus file NFC-normalized line by line; errors propagate."""
+        with open(file_path, 'rb') as file:
+            if os.fstat(file.fileno()).st_size == 0:
+                return ""  # mmap refuses empty files
+            # Memory-map the file and normalize each line as it is decoded, so no
+            # second full-size copy is made by normalizing the whole text at once
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return ''.join(self.normalize_text(line.decode('utf-8'))
+                               for line in iter(mm.readline, b''))
     
     def load_corpus(self, file_path):
-        """Load corpus from file with UTF-8 encoding."""
+        """Load corpus from file with UTF-8 encoding, NFC-normalized line by line."""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
+            return self._read_corpus(file_path)
         except FileNotFoundError:
             print(f"Warning: File {file_path} not found.")
             return ""
@@ -60,53 +148,96 @@ class SindhiCorpusAnalyzer:
             return ""
     
     def extract_sindhi_words(self, text):
-        """Extract Sindhi words from text, preserving Unicode joins."""
-        # Normalize text first
-        text = self.normalize_text(text)
-        
-        # Pattern to match Sindhi words (Sindhi/Arabic chars + possible diacritics)
-        word_pattern = r'[' + self.sindhi_chars[2:-1] + r']+'
-        words = re.findall(word_pattern, text)
-        
-        return [word for word in words if len(word) > 1]  # Filter single characters
+        """Extract Sindhi words from text, preserving Unicode joins.
+
+        Expects text already NFC-normalized by load_corpus.
+        """
+        # Scan Sindhi words (Sindhi/Arabic chars + possible diacritics) with the compiled
+        # pattern; findall builds the list in C, faster than consuming finditer matches
+        return SINDHI_WORD_RE.findall(text)
     
     def calculate_corpus_statistics(self, text, corpus_name):
-        """Calculate comprehensive corpus statistics."""
-        words = self.extract_sindhi_words(text)
-        sentences = self.split_sentences(text)
+        """Calculate comprehensive corpus statistics and the word frequency Counter."""
+        word_freq = Counter(self.extract_sindhi_words(text))
+        sentence_count = len(self.split_sentences(text))
+        
+        total_words = sum(word_freq.values())
+        unique_words = len(word_freq)
+        total_length = sum(len(word) * count for word, count in word_freq.items())
         
         stats = {
             'corpus_name': corpus_name,
             'total_characters': len(text),
-            'total_words': len(words),
-            'total_sentences': len(sentences),
-            'unique_words': len(set(words)),
-            'avg_word_length': sum(len(word) for word in words) / len(words) if words else 0,
-            'avg_sentence_length': len(words) / len(sentences) if sentences else 0,
-            'vocabulary_diversity': len(set(words)) / len(words) if words else 0
+            'total_words': total_words,
+            'total_sentences': sentence_count,
+            'unique_words': unique_words,
+            'avg_word_length': total_length / total_words if total_words else 0,
+            'avg_sentence_length': total_words / sentence_count if sentence_count else 0,
+            'vocabulary_diversity': unique_words / total_words if total_words else 0
         }
         
-        return stats, words, sentences
+        return stats, word_freq, sentence_count
+    
+    def _cached_freq(self, file_path, corpus_name, stats_only=False):
+        """Return stats and the word Counter for file_path, reusing a pickled result if the file is unchanged.
+        
+        The cache entry is keyed by CACHE_VERSION and the file's path, size and
+        mtime, so editing or replacing the corpus invalidates it automatically.
+        Writing a new entry removes the older ones for the same file. A file that
+        fails to load is reported and counted as empty but never cached.
+        With stats_only=True only the stats dict is returned, so a worker process
+        does not send the Counter back to its caller.
+        """
+        if not os.path.exists(file_path):
+            # Nothing to key a cache entry on; load_corpus reports the missing file
+            stats, word_freq = self.calculate_corpus_statistics(self.load_corpus(file_path), corpus_name)[:2]
+            return stats if stats_only else (stats, word_freq)
+        
+        st = os.stat(file_path)
+        key = f"v{CACHE_VERSION}-{st.st_size}-{st.st_mtime_ns}"
+        path_hash = hashlib.sha1(os.path.abspath(file_path).encode('utf-8')).hexdigest()
+        cache_path = os.path.join(self.cache_dir, f"{path_hash}.{key}.pkl")
+        
+        cached = _load_pickle(cache_path)
+        if cached is not None:
+            stats, word_freq = cached
+            stats['corpus_name'] = corpus_name
+        else:
+            try:
+                text = self._read_corpus(file_path)
+            except Exception as e:
+                # Not cached: fixing the file (e.g. its permissions) need not change
+                # the size or mtime the key is built from
+                print(f"Error loading {file_path}: {e}")
+                stats, word_freq = self.calculate_corpus_statistics("", corpus_name)[:2]
+            else:
+                stats, word_freq = self.calculate_corpus_statistics(text, corpus_name)[:2]
+                stale_pattern = os.path.join(glob.escape(self.cache_dir), f"{path_hash}.*.pkl")
+                _dump_pickle((stats, word_freq), cache_path, stale_pattern)
+        return stats if stats_only else (stats, word_freq)
     
     def split_sentences(self, text):
         """Split text into sentences using Sindhi punctuation."""
-        # Sindhi sentence boundaries: ۔ (Arabic full stop), ؟ (Arabic question mark), ! 
-        sentences = re.split(r'[۔؟!]+', text)
+        sentences = SENTENCE_SPLIT_RE.split(text)
         return [s.strip() for s in sentences if s.strip()]
     
-    def generate_word_frequency(self, words, top_n=50):
-        """Generate word frequency analysis."""
-        word_freq = Counter(words)
+    def generate_word_frequency(self, word_freq, top_n=50):
+        """Generate word frequency analysis from a word Counter."""
         return word_freq.most_common(top_n)
     
-    def create_wordcloud(self, words, output_file):
-        """Create a word cloud from Sindhi words."""
+    def create_wordcloud(self, word_freq, output_file, max_words=200, rtl_labels=None):
+        """Create a word cloud from a Counter of Sindhi words."""
         try:
-            # Combine words into text
-            text = ' '.join(words)
+            from wordcloud import WordCloud
+            plt = self._pyplot()
             
-            # Prepare text for RTL display
-            prepared_text = self.prepare_rtl_text(text)
+            # WordCloud draws at most max_words, so only those need RTL reshaping
+            top_freq = word_freq.most_common(max_words)
+            # Words that differ only in harakat reshape to the same label; sum their counts
+            prepared_freq = {}
+            for word, count in top_freq:
+                label = self.rtl_label(word, rtl_labels)
+                prepared_freq[label] = prepared_freq.get(label, 0) + count
             
             # Configure word cloud for RTL
             wordcloud = WordCloud(
@@ -114,35 +245,36 @@ class SindhiCorpusAnalyzer:
                 width=1200,
                 height=800,
                 background_color='white',
-                max_words=200,
+                max_words=max_words,
                 colormap='viridis',
-                prefer_horizontal=0.7  # Mix of horizontal and vertical for RTL
-            ).generate(prepared_text)
+                prefer_horizontal=0.7,  # Mix of horizontal and vertical for RTL
+                collocations=False  # Frequencies are precomputed; no bigram detection needed
+            ).generate_from_frequencies(prepared_freq)
             
             plt.figure(figsize=(15, 10))
             plt.imshow(wordcloud, interpolation='bilinear')
             plt.axis('off')
             plt.title(self.prepare_rtl_text('سندي لفظن جو بادل'), fontsize=16, pad=20)
             plt.tight_layout()
-            plt.savefig(output_file, dpi=300, bbox_inches='tight', facecolor='white')
+            plt.savefig(output_file, dpi=self.dpi, bbox_inches='tight', facecolor='white')
             plt.close()
             print(f"Word cloud saved to: {output_file}")
             
         except Exception as e:
             print(f"Error creating word cloud: {e}")
             # Fallback: create a simple frequency visualization
-            self.create_fallback_visualization(words, output_file)
+            self.create_fallback_visualization(word_freq, output_file, rtl_labels)
     
-    def create_fallback_visualization(self, words, output_file):
+    def create_fallback_visualization(self, word_freq, output_file, rtl_labels=None):
         """Create a fallback visualization if wordcloud fails."""
-        word_freq = Counter(words)
+        plt = self._pyplot()
         top_words = word_freq.most_common(20)
         
         if not top_words:
             return
             
         words_list, counts = zip(*top_words)
-        prepared_words = [self.prepare_rtl_text(word) for word in words_list]
+        prepared_words = [self.rtl_label(word, rtl_labels) for word in words_list]
         
         plt.figure(figsize=(12, 8))
         bars = plt.barh(range(len(prepared_words)), counts)
@@ -150,24 +282,23 @@ class SindhiCorpusAnalyzer:
         plt.xlabel('Frequency')
         plt.title(self.prepare_rtl_text('سندي لفظن جي فرقينس'))
         
-        # Add value labels on bars
-        for bar, count in zip(bars, counts):
-            plt.text(bar.get_width() + 0.1, bar.get_y() + bar.get_height()/2, 
-                    str(count), ha='left', va='center')
+        # Add value labels on bars in one batched call
+        plt.gca().bar_label(bars, labels=[str(c) for c in counts], padding=3)
         
         plt.tight_layout()
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        plt.savefig(output_file, dpi=self.dpi, bbox_inches='tight')
         plt.close()
         print(f"Fallback visualization saved to: {output_file}")
     
-    def plot_frequency_distribution(self, word_freq, output_file, top_n=30):
+    def plot_frequency_distribution(self, word_freq, output_file, top_n=30, rtl_labels=None):
         """Plot frequency distribution of top words."""
+        plt = self._pyplot()
         if not word_freq:
             print("No word frequency data to plot.")
             return
             
         words, frequencies = zip(*word_freq[:top_n])
-        prepared_words = [self.prepare_rtl_text(word) for word in words]
+        prepared_words = [self.rtl_label(word, rtl_labels) for word in words]
         
         plt.figure(figsize=(14, 8))
         bars = plt.bar(range(len(prepared_words)), frequencies, color='skyblue', alpha=0.7)
@@ -177,83 +308,85 @@ class SindhiCorpusAnalyzer:
         plt.title(self.prepare_rtl_text(f'سڀ کان وڌيڪ استعمال ٿيندڙ {top_n} سندي لفظ'))
         plt.xticks(range(len(prepared_words)), prepared_words, rotation=45, ha='right')
         
-        # Add value labels on bars
-        for bar, freq in zip(bars, frequencies):
-            plt.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.1,
-                    str(freq), ha='center', va='bottom', fontsize=8)
+        # Add value labels on bars in one batched call
+        plt.gca().bar_label(bars, labels=[str(f) for f in frequencies], padding=3, fontsize=8)
         
         plt.tight_layout()
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        plt.savefig(output_file, dpi=self.dpi, bbox_inches='tight')
         plt.close()
         print(f"Frequency distribution saved to: {output_file}")
     
     def save_word_frequency_csv(self, word_freq, output_file):
-        """Save word frequency data to CSV."""
-        df = pd.DataFrame(word_freq, columns=['word', 'frequency'])
-        df['word_prepared'] = df['word'].apply(self.prepare_rtl_text)
-        df.to_csv(output_file, index=False, encoding='utf-8')
+        """Save word frequency data to CSV.
+        
+        Words are written in logical order; RTL reshaping is a display step and is
+        left to the plotting code.
+        """
+        with open(output_file, 'w', encoding='utf-8', newline='') as csvfile:
+            writer = csv.writer(csvfile, lineterminator='\n')
+            writer.writerow(['rank', 'word', 'frequency'])
+            writer.writerows((i, word, count) for i, (word, count) in enumerate(word_freq, start=1))
         print(f"Word frequency CSV saved to: {output_file}")
     
     def save_statistics_csv(self, stats_before, stats_after, output_file):
         """Save corpus statistics to CSV."""
-        stats_df = pd.DataFrame([stats_before, stats_after])
-        stats_df.to_csv(output_file, index=False, encoding='utf-8')
+        with open(output_file, 'w', encoding='utf-8', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=list(stats_before), lineterminator='\n')
+            writer.writeheader()
+            writer.writerows([stats_before, stats_after])
         print(f"Corpus statistics saved to: {output_file}")
     
     def compare_corpora(self, raw_stats, cleaned_stats):
-        """Generate comparison between raw and cleaned corpora."""
-        comparison = {
-            'metric': [
-                'Total Words', 'Unique Words', 'Vocabulary Diversity',
-                'Total Sentences', 'Average Sentence Length'
-            ],
-            'raw_corpus': [
-                raw_stats['total_words'], raw_stats['unique_words'],
-                raw_stats['vocabulary_diversity'], raw_stats['total_sentences'],
-                raw_stats['avg_sentence_length']
-            ],
-            'cleaned_corpus': [
-                cleaned_stats['total_words'], cleaned_stats['unique_words'],
-                cleaned_stats['vocabulary_diversity'], cleaned_stats['total_sentences'],
-                cleaned_stats['avg_sentence_length']
-            ],
-            'change_percent': [
-                ((cleaned_stats['total_words'] - raw_stats['total_words']) / raw_stats['total_words'] * 100) if raw_stats['total_words'] > 0 else 0,
-                ((cleaned_stats['unique_words'] - raw_stats['unique_words']) / raw_stats['unique_words'] * 100) if raw_stats['unique_words'] > 0 else 0,
-                ((cleaned_stats['vocabulary_diversity'] - raw_stats['vocabulary_diversity']) / raw_stats['vocabulary_diversity'] * 100) if raw_stats['vocabulary_diversity'] > 0 else 0,
-                ((cleaned_stats['total_sentences'] - raw_stats['total_sentences']) / raw_stats['total_sentences'] * 100) if raw_stats['total_sentences'] > 0 else 0,
-                ((cleaned_stats['avg_sentence_length'] - raw_stats['avg_sentence_length']) / raw_stats['avg_sentence_length'] * 100) if raw_stats['avg_sentence_length'] > 0 else 0
-            ]
-        }
-        return pd.DataFrame(comparison)
+        """Generate comparison rows (one dict per metric) between raw and cleaned corpora."""
+        metrics = [
+            ('Total Words', 'total_words'),
+            ('Unique Words', 'unique_words'),
+            ('Vocabulary Diversity', 'vocabulary_diversity'),
+            ('Total Sentences', 'total_sentences'),
+            ('Average Sentence Length', 'avg_sentence_length'),
+        ]
+        comparison = []
+        for label, key in metrics:
+            raw_value, cleaned_value = raw_stats[key], cleaned_stats[key]
+            comparison.append({
+                'metric': label,
+                'raw_corpus': raw_value,
+                'cleaned_corpus': cleaned_value,
+                'change_percent': ((cleaned_value - raw_value) / raw_value * 100) if raw_value > 0 else 0,
+            })
+        return comparison
     
     def analyze_corpus(self, raw_corpus_path, cleaned_corpus_path):
         """Main analysis function for both raw and cleaned corpora."""
         print("Starting Sindhi corpus analysis...")
         
-        # Load corpora
-        raw_text = self.load_corpus(raw_corpus_path)
-        cleaned_text = self.load_corpus(cleaned_corpus_path)
+        # Load corpora and calculate statistics (reused from the cache when unchanged).
+        # The two corpora are independent, so each is analyzed in its own worker process.
+        print("Calculating corpus statistics...")
+        with ProcessPoolExecutor(max_workers=2) as executor:
+            # Only the raw stats are reported, so its Counter stays in the worker
+            raw_future = executor.submit(self._cached_freq, raw_corpus_path, "raw_corpus", stats_only=True)
+            cleaned_future = executor.submit(self._cached_freq, cleaned_corpus_path, "cleaned_corpus")
+            raw_stats = raw_future.result()
+            cleaned_stats, cleaned_freq = cleaned_future.result()
         
-        if not raw_text and not cleaned_text:
+        if not raw_stats['total_characters'] and not cleaned_stats['total_characters']:
             print("Error: Both corpora are empty. Analysis cannot proceed.")
             return
         
-        # Calculate statistics
-        print("Calculating corpus statistics...")
-        raw_stats, raw_words, raw_sentences = self.calculate_corpus_statistics(raw_text, "raw_corpus")
-        cleaned_stats, cleaned_words, cleaned_sentences = self.calculate_corpus_statistics(cleaned_text, "cleaned_corpus")
-        
         # Generate word frequencies
         print("Generating word frequencies...")
-        raw_word_freq = self.generate_word_frequency(raw_words)
-        cleaned_word_freq = self.generate_word_frequency(cleaned_words)
+        cleaned_word_freq = self.generate_word_frequency(cleaned_freq)
         
-        # Create visualizations for cleaned corpus
+        # Create visualizations for cleaned corpus. Every chart draws from the same top
+        # words, so reshape them for RTL display once and share the labels.
         print("Creating visualizations...")
-        self.create_wordcloud(cleaned_words, os.path.join(self.output_dir, "wordcloud.png"))
+        rtl_labels = {word: self.prepare_rtl_text(word) for word, _ in cleaned_freq.most_common(200)}
+        self.create_wordcloud(cleaned_freq, os.path.join(self.output_dir, "wordcloud.png"),
+                              rtl_labels=rtl_labels)
         self.plot_frequency_distribution(cleaned_word_freq, 
-                                       os.path.join(self.output_dir, "frequency_distribution.png"))
+                                       os.path.join(self.output_dir, "frequency_distribution.png"),
+                                       rtl_labels=rtl_labels)
         
         # Save data files
         print("Saving analysis outputs...")
@@ -263,9 +396,12 @@ class SindhiCorpusAnalyzer:
                                os.path.join(self.output_dir, "corpus_statistics.csv"))
         
         # Generate comparison
-        comparison_df = self.compare_corpora(raw_stats, cleaned_stats)
-        comparison_df.to_csv(os.path.join(self.output_dir, "corpus_comparison.csv"), 
-                           index=False, encoding='utf-8')
+        comparison = self.compare_corpora(raw_stats, cleaned_stats)
+        with open(os.path.join(self.output_dir, "corpus_comparison.csv"), 'w',
+                  encoding='utf-8', newline='') as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=['metric', 'raw_corpus', 'cleaned_corpus', 'change_percent'], lineterminator='\n')
+            writer.writeheader()
+            writer.writerows(comparison)
         
         # Print summary
         self.print_analysis_summary(raw_stats, cleaned_stats)
@@ -308,8 +444,13 @@ class SindhiCorpusAnalyzer:
         print(f"  • Corpus Comparison: {self.output_dir}/corpus_comparison.csv")
         print("="*60)
 
-def main():
+def main(argv=None):
     """Main execution function."""
+    parser = argparse.ArgumentParser(description="Analyze raw and cleaned Sindhi corpora")
+    parser.add_argument("--dpi", type=int, default=150,
+                        help="Resolution of saved figures (default: 150; use 300 for print quality)")
+    args = parser.parse_args(argv)
+    
     # File paths
     base_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
     raw_corpus_path = os.path.join(base_dir, "data", "raw_corpus.txt")
@@ -328,7 +469,7 @@ def main():
             return
     
     # Initialize analyzer and run analysis
-    analyzer = SindhiCorpusAnalyzer(output_dir)
+    analyzer = SindhiCorpusAnalyzer(output_dir, dpi=args.dpi)
     analyzer.analyze_corpus(raw_corpus_path, cleaned_corpus_path)
 
 if __name__ == "__main__":
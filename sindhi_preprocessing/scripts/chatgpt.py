@@ -1,21 +1,24 @@
 # Arabic shaping / bidi for correct Arabic-script rendering
 from __future__ import annotations
 import arabic_reshaper
+import bidi
 from bidi.algorithm import get_display
-from matplotlib import font_manager
-from matplotlib.font_manager import FontProperties
 import argparse
 import csv
+import glob
+import hashlib
+import heapq
+import mmap
 import os
+import pickle
 import sys
 import unicodedata
 import re
 from collections import Counter
+from operator import itemgetter
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, asdict
-from typing import List, Tuple, Dict
-
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
+from typing import Iterable, Iterator, List, Tuple, Dict
 
 # -----------------------------
 # Regex and utility definitions
@@ -26,6 +29,9 @@ ARABIC_SINDHI_RE = re.compile(r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF]+")
 # Sentence splitter (used only for optional raw analysis if sentences are present)
 SENTENCE_SPLIT_RE = re.compile(r"[۔؟!?]+")
 
+# Part of every cache key; bump when tokenization or the cached data format changes
+CACHE_VERSION = 2
+
 @dataclass
 class CorpusStats:
     line_count: int
@@ -37,35 +43,50 @@ class CorpusStats:
 # Core functions
 # -----------------------------
 
-def read_text_file(path: str) -> str:
-    """Read a UTF-8 text file and return normalized (NFC) text."""
-    with open(path, "r", encoding="utf-8") as f:
-        raw = f.read()
-    return unicodedata.normalize("NFC", raw)
+def read_text_lines(path: str) -> Iterator[str]:
+    """Memory-map a UTF-8 text file and yield its lines normalized (NFC).
+
+    Lines are decoded and normalized one at a time, so the whole file is never
+    held as a single Python string. NFC is applied per line, which is safe for
+    Sindhi text because no combining sequence spans a newline. Each \n-terminated
+    chunk is further split with str.splitlines, so CR, NEL and U+2028 separators
+    still count as line breaks, as with reading the whole text.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # mmap refuses empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for chunk in iter(mm.readline, b""):
+                yield from unicodedata.normalize("NFC", chunk.decode("utf-8")).splitlines()
 
 
-def extract_words(text: str) -> List[str]:
-    """Extract words that belong to Sindhi/Arabic Unicode ranges.
+def extract_words(text: str) -> Iterator[str]:
+    """Lazily yield words that belong to Sindhi/Arabic Unicode ranges.
 
     This avoids splitting joined glyphs and is robust across whitespace
     and punctuation variations.
     """
-    # Find all matches of Arabic/Sindhi runs and return them (lowercasing is not applied because
+    # Yield matches of Arabic/Sindhi runs one at a time (lowercasing is not applied because
     # Arabic-script languages don't have case distinctions like Latin scripts).
-    return ARABIC_SINDHI_RE.findall(text)
+    return (m.group() for m in ARABIC_SINDHI_RE.finditer(text))
 
 
-def compute_stats_from_text(text: str) -> Tuple[CorpusStats, Counter]:
-    """Compute corpus statistics and word frequency counter from raw text."""
-    lines = [ln for ln in text.splitlines() if ln.strip()]
-    line_count = len(lines)
+def compute_stats_from_text(lines: Iterable[str]) -> Tuple[CorpusStats, Counter]:
+    """Compute corpus statistics and word frequency counter from an iterable of lines."""
+    line_count = 0
+    freq: Counter = Counter()
+    for line in lines:
+        if line.strip():
+            line_count += 1
+        # Counter consumes the lazy regex matches directly (counting happens in C), so no
+        # intermediate word list is built; totals are then derived from the vocabulary.
+        freq.update(extract_words(line))
 
-    words = extract_words(text)
-    word_count = len(words)
-    freq = Counter(words)
+    word_count = sum(freq.values())
+    sum_len = sum(len(w) * c for w, c in freq.items())
 
     unique_word_count = len(freq)
-    avg_word_length = (sum(len(w) for w in words) / word_count) if word_count else 0.0
+    avg_word_length = (sum_len / word_count) if word_count else 0.0
 
     stats = CorpusStats(
         line_count=line_count,
@@ -76,42 +97,218 @@ def compute_stats_from_text(text: str) -> Tuple[CorpusStats, Counter]:
     return stats, freq
 
 
+def compute_stats_compressed(
+    lines: Iterable[str], table_bits: int = 22, min_count: int = 10
+) -> Tuple[CorpusStats, Counter]:
+    """Approximate compute_stats_from_text in memory bounded by a fixed hash table.
+
+    Every word bumps one counter in each of two numpy rows of 2**table_bits
+    slots, picked by different bits of its hash (a count-min sketch); only words
+    whose estimate reaches min_count are remembered by name, so the long tail of
+    rare words never enters a Python dict. A word's frequency is the smaller of
+    its two counters, which can only overestimate when both slots are shared,
+    and unique_word_count counts occupied slots in the first row (a lower
+    bound). Line and word counts and the average word length are exact.
+    """
+    import numpy as np
+
+    mask = (1 << table_bits) - 1
+    first = np.zeros(1 << table_bits, dtype=np.uint32)
+    second = np.zeros(1 << table_bits, dtype=np.uint32)
+    # Insertion-ordered (first time a word crosses min_count), so ties keep a stable
+    # order across runs even though str hashes are salted per process
+    heavy: Dict[str, None] = {}
+    line_count = word_count = sum_len = 0
+    for line in lines:
+        if line.strip():
+            line_count += 1
+        for w in extract_words(line):
+            word_count += 1
+            sum_len += len(w)
+            h = hash(w)
+            i, j = h & mask, (h >> table_bits) & mask
+            first[i] += 1
+            second[j] += 1
+            if first[i] >= min_count and second[j] >= min_count:
+                heavy.setdefault(w)
+
+    # Built-in str hashes are salted per process, so the slots are resolved here
+    # rather than cached; the Counter returned holds plain words and counts.
+    freq = Counter()
+    for w in heavy:
+        h = hash(w)
+        freq[w] = int(min(first[h & mask], second[(h >> table_bits) & mask]))
+    avg_word_length = (sum_len / word_count) if word_count else 0.0
+
+    stats = CorpusStats(
+        line_count=line_count,
+        word_count=word_count,
+        unique_word_count=int(np.count_nonzero(first)),
+        avg_word_length=round(avg_word_length, 3),
+    )
+    return stats, freq
+
+
+def _load_pickle(path: str):
+    """Return the object pickled at path, or None if it is missing or unreadable."""
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        # A truncated or incompatible cache file is treated as a cache miss
+        return None
+
+
+def _dump_pickle(obj, path: str, stale_pattern: str | None = None) -> None:
+    """Pickle obj to path through a temporary file, so readers never see a partial write.
+
+    Caching is best effort: if the file cannot be written the run carries on
+    uncached. After a successful write, other files matching stale_pattern
+    (older entries for the same input) are removed.
+    """
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(obj, f, protocol=5)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"[warn] could not write cache file {path}: {e}")
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return
+    if stale_pattern:
+        for stale in glob.glob(stale_pattern):
+            if stale != path:
+                try:
+                    os.remove(stale)
+                except OSError:
+                    pass
+
+
+def _cached_freq(
+    path: str, cache_dir: str, compressed: bool = False, stats_only: bool = False
+) -> Tuple[CorpusStats, Counter] | CorpusStats:
+    """Return stats and frequencies for path, reusing a pickled result if the file is unchanged.
+
+    The cache entry is keyed by CACHE_VERSION and the file's path, size and
+    mtime, so editing or replacing the corpus invalidates it automatically.
+    Writing a new entry removes the older ones for the same file.
+    Exact and compressed counts are cached separately. Stats are stored as a
+    plain dict so the entry loads no matter which module defined CorpusStats.
+    With stats_only=True only the stats are returned, so a worker process does
+    not send the Counter back to its caller.
+    """
+    st = os.stat(path)
+    key = f"v{CACHE_VERSION}-{st.st_size}-{st.st_mtime_ns}"
+    path_hash = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    mode = "compressed" if compressed else "exact"
+    cache_path = os.path.join(cache_dir, f"{path_hash}.{key}.{mode}.pkl")
+
+    cached = _load_pickle(cache_path)
+    if cached is not None:
+        stats, freq = cached
+        stats = CorpusStats(**stats)
+    else:
+        compute = compute_stats_compressed if compressed else compute_stats_from_text
+        stats, freq = compute(read_text_lines(path))
+        stale_pattern = os.path.join(glob.escape(cache_dir), f"{path_hash}.*.{mode}.pkl")
+        _dump_pickle((asdict(stats), freq), cache_path, stale_pattern)
+    return stats if stats_only else (stats, freq)
+
+
 def save_word_frequency_csv(freq: Counter, out_path: str, top_n: int | None = None) -> None:
-    """Save word frequency counts to CSV with columns: word, count, rank."""
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    items = freq.most_common(top_n)
+    """Save word frequency counts to CSV with columns: word, count, rank.
+
+    top_n=None writes the whole vocabulary, which requires a full sort; pass a
+    limit when only the head is needed so a bounded heap selection is used.
+    """
+    if top_n is None:
+        items = freq.most_common()
+    else:
+        items = heapq.nlargest(top_n, freq.items(), key=itemgetter(1))
     with open(out_path, "w", encoding="utf-8", newline="") as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(["rank", "word", "count"])
-        for i, (w, c) in enumerate(items, start=1):
-            writer.writerow([i, w, c])
+        writer.writerows((i, w, c) for i, (w, c) in enumerate(items, start=1))
 
 
 def save_stats_csv(stats: CorpusStats, out_path: str) -> None:
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
     with open(out_path, "w", encoding="utf-8", newline="") as csvfile:
         writer = csv.writer(csvfile)
         writer.writerow(["metric", "value"])
-        for k, v in asdict(stats).items():
-            writer.writerow([k, v])
+        writer.writerows(asdict(stats).items())
 
-def shape_for_display(word: str) -> str:
+# Display forms already computed, shared by the bar chart and the wordcloud
+_SHAPED: Dict[str, str] = {}
+
+
+def shape_words(words: Iterable[str]) -> List[str]:
     """
-    Shape + reorder Arabic-script word for display in matplotlib/WordCloud.
-    Returns a visual representation ready for plotting.
+    Shape + reorder Arabic-script words for display in matplotlib/WordCloud.
+    Returns the visual representations in input order. Words not shaped before
+    are reshaped in a single arabic_reshaper call over the newline-joined batch
+    (its per-call setup dominates for short words; a newline never joins or
+    forms a ligature, so each line shapes exactly as on its own), then reordered
+    word by word. Words that contain a newline themselves, or a batch that does
+    not split back into one line per word, are shaped one at a time. Results
+    are memoized.
     """
-    # arabic_reshaper.reshape returns shaped glyph sequence (ligatures)
-    try:
-        reshaped = arabic_reshaper.reshape(word)
-        bidi = get_display(reshaped)
-        return bidi
-    except Exception:
-        # if shaping fails for any reason, return original safely
-        return word
+    words = list(words)
+    missing = [w for w in dict.fromkeys(words) if w not in _SHAPED]
+    batch = [w for w in missing if "\n" not in w]
+    if batch:
+        try:
+            reshaped = arabic_reshaper.reshape("\n".join(batch)).split("\n")
+            if len(reshaped) == len(batch):
+                _SHAPED.update(zip(batch, map(get_display, reshaped)))
+        except Exception:
+            pass  # the words are shaped one at a time below
+    for word in missing:
+        if word not in _SHAPED:
+            try:
+                _SHAPED[word] = get_display(arabic_reshaper.reshape(word))
+            except Exception:
+                # if shaping fails for any reason, return original safely
+                _SHAPED[word] = word
+    return [_SHAPED[w] for w in words]
+
+
+def shape_for_display(word: str) -> str:
+    """Shape + reorder a single word; see shape_words."""
+    return shape_words([word])[0]
+
+
+def _shape_cache_path(cache_dir: str) -> str:
+    # Display forms depend only on the word and the shaping libraries, so one file
+    # serves every corpus and a library upgrade starts a fresh one
+    return os.path.join(cache_dir, f"shapes-{arabic_reshaper.__version__}-{bidi.VERSION}.pkl")
+
+
+def load_shape_cache(cache_dir: str) -> int:
+    """Load display forms saved by earlier runs into the memo; returns its size.
+
+    A missing or unreadable cache file leaves the memo as it is.
+    """
+    cached = _load_pickle(_shape_cache_path(cache_dir))
+    if isinstance(cached, dict):
+        _SHAPED.update(cached)
+    return len(_SHAPED)
+
+
+def save_shape_cache(cache_dir: str) -> None:
+    """Persist the display-form memo for later runs."""
+    _dump_pickle(_SHAPED, _shape_cache_path(cache_dir))
 
 def plot_top_frequency(freq: Counter, out_path: str, top_n: int = 30, font_path: str | None = None) -> None:
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
-    most = freq.most_common(top_n)
+    # Plotting libraries are imported lazily so stats-only runs skip their import cost
+    import matplotlib.pyplot as plt
+    from matplotlib.font_manager import FontProperties
+
+    # Bounded heap selection over the vocabulary; only these words get shaped below
+    most = heapq.nlargest(top_n, freq.items(), key=itemgetter(1))
     if not most:
         print("[warn] no tokens to plot for frequency distribution.")
         return
@@ -122,27 +319,33 @@ def plot_top_frequency(freq: Counter, out_path: str, top_n: int = 30, font_path:
     fp = FontProperties(fname=font_path) if font_path else None
 
     # reshape words for display
-    disp_words = [shape_for_display(w) for w in words]
+    disp_words = shape_words(words)
 
-    plt.figure(figsize=(12, 6))
-    plt.bar(range(len(disp_words)), counts)
-    plt.xticks(range(len(disp_words)), disp_words, rotation=45, ha="right", fontproperties=fp)
-    plt.xlabel("Words", fontproperties=fp)
-    plt.ylabel("Frequency", fontproperties=fp)
-    plt.title(f"Top {len(disp_words)} word frequency distribution", fontproperties=fp)
-    plt.tight_layout()
-    plt.savefig(out_path, dpi=300)
-    plt.close()
+    fig, ax = plt.subplots(figsize=(12, 6))
+    ax.bar(range(len(disp_words)), counts)
+    ax.set_xticks(range(len(disp_words)), disp_words, rotation=45, ha="right", fontproperties=fp)
+    ax.set_xlabel("Words", fontproperties=fp)
+    ax.set_ylabel("Frequency", fontproperties=fp)
+    ax.set_title(f"Top {len(disp_words)} word frequency distribution", fontproperties=fp)
+    fig.tight_layout()
+    fig.savefig(out_path, dpi=200)
+    plt.close(fig)
 
 
 def generate_wordcloud(freq: Counter, out_path: str, font_path: str | None = None, max_words: int = 200) -> None:
-    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    from wordcloud import WordCloud
+
     if not freq:
         print("[warn] empty frequency; skipping wordcloud generation.")
         return
 
-    # Create a shaped frequency dictionary for rendering
-    shaped_freq = { shape_for_display(k): v for k, v in freq.items() }
+    # Create a shaped frequency dictionary for rendering; WordCloud draws at most
+    # max_words entries, so only those are shaped
+    top = freq.most_common(max_words)
+    shaped_freq: Dict[str, int] = {}
+    # Words that differ only in harakat shape to the same form; sum their counts
+    for shaped, (_, count) in zip(shape_words(w for w, _ in top), top):
+        shaped_freq[shaped] = shaped_freq.get(shaped, 0) + count
 
     wc = WordCloud(
         width=1600,
@@ -153,7 +356,9 @@ def generate_wordcloud(freq: Counter, out_path: str, font_path: str | None = Non
         collocations=False,
     )
     wc.generate_from_frequencies(shaped_freq)
-    wc.to_file(out_path)
+    # WordCloud.to_file saves with optimize=True, an extra compression pass the
+    # output does not need
+    wc.to_image().save(out_path, optimize=False)
 
 # -----------------------------
 # Main CLI
@@ -166,6 +371,9 @@ def main(argv: List[str] | None = None) -> int:
     parser.add_argument("--font-path", default=None, help="Optional path to a TTF font that supports Arabic/Sindhi (recommended)")
     parser.add_argument("--top-n-words", type=int, default=200, help="How many words to include in wordcloud and CSV (default: 200)")
     parser.add_argument("--plot-top-n", type=int, default=30, help="Top N words to plot in the bar chart (default: 30)")
+    parser.add_argument("--skip-plots", action="store_true", help="Only write stats and frequency CSVs; skip the plot and wordcloud")
+    parser.add_argument("--cache-dir", default="processed/.cache", help="Directory for cached word counts, reused while a corpus file is unchanged")
+    parser.add_argument("--compressed-counts", action="store_true", help="Count words in a fixed-size hash table (needs numpy); approximate, for vocabularies too large to hold in memory")
     args = parser.parse_args(argv)
 
     data_dir = args.data_dir
@@ -182,13 +390,17 @@ def main(argv: List[str] | None = None) -> int:
         print(f"[error] missing cleaned file: {cleaned_path}")
         return 2
 
-    print("Reading and analyzing raw corpus...")
-    raw_text = read_text_file(raw_path)
-    raw_stats, raw_freq = compute_stats_from_text(raw_text)
+    # Every artifact is written directly into out_dir, so it is created once here
+    os.makedirs(out_dir, exist_ok=True)
 
-    print("Reading and analyzing cleaned corpus...")
-    cleaned_text = read_text_file(cleaned_path)
-    cleaned_stats, cleaned_freq = compute_stats_from_text(cleaned_text)
+    # The two corpora are independent, so analyze them in parallel worker processes
+    print("Reading and analyzing raw and cleaned corpora...")
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        # Only the raw stats are reported, so its Counter stays in the worker
+        raw_future = executor.submit(_cached_freq, raw_path, args.cache_dir, args.compressed_counts, stats_only=True)
+        cleaned_future = executor.submit(_cached_freq, cleaned_path, args.cache_dir, args.compressed_counts)
+        raw_stats = raw_future.result()
+        cleaned_stats, cleaned_freq = cleaned_future.result()
 
     # Save stats
     save_stats_csv(raw_stats, os.path.join(out_dir, "corpus_statistics_before.csv"))
@@ -198,7 +410,13 @@ def main(argv: List[str] | None = None) -> int:
     save_word_frequency_csv(cleaned_freq, os.path.join(out_dir, "word_frequency.csv"), top_n=args.top_n_words)
 
     # Create plots and wordcloud
+    if args.skip_plots:
+        print(f"Analysis complete (plots skipped). Outputs in: {out_dir}")
+        return 0
+
     print("Generating frequency distribution plot and wordcloud (may warn if font missing)...")
+    # Words shaped by earlier runs are reused; newly shaped ones are saved below
+    shaped_before = load_shape_cache(args.cache_dir)
     try:
         plot_top_frequency(cleaned_freq, os.path.join(out_dir, "frequency_distribution.png"), top_n=args.plot_top_n, font_path=font_path)
 
@@ -210,6 +428,9 @@ def main(argv: List[str] | None = None) -> int:
     except Exception as e:
         print(f"[error] failed to create wordcloud: {e}")
 
+    if len(_SHAPED) > shaped_before:
+        save_shape_cache(args.cache_dir)
+
     print(f"Analysis complete. Outputs in: {out_dir}")
     print("Important: for visually correct Sindhi/Arabic rendering, supply --font-path to a Nastaliq or Arabic font (eg. NotoSansArabic or NotoNastaliqUrdu).")
     return 0
@@ -16,9 +16,12 @@ Run inside GitHub Codespaces terminal:
     python3 scripts/preprocess_sindhi.py
 """
 
+import mmap
 import os
 import re
 import unicodedata
+from itertools import filterfalse
+from multiprocessing import Pool
 
 # === Step 1: Define file paths ===
 BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -29,75 +32,158 @@ INPUT_FILE = os.path.join(DATA_DIR, "raw_corpus.txt")
 STOPWORDS_FILE = os.path.join(DATA_DIR, "sindhi_stopwords.txt")
 OUTPUT_FILE = os.path.join(OUTPUT_DIR, "cleaned_corpus.txt")
 
+# Regexes are compiled once here and reused by every step below
+# Whole runs of characters outside the Sindhi (Arabic-based) blocks, whitespace and ۔ ؟
+DISALLOWED_RE = re.compile(r"[^\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\s۔؟]+")
+SENTENCE_SPLIT_RE = re.compile(r"[۔؟!]")
+
+# 1 MiB output buffer: the cleaned corpus is several MB, so the default 8 KiB means many small writes
+IO_BUFFER_SIZE = 1 << 20
+
+# Bytes per block handed to a worker process; blocks always end on a sentence boundary
+BLOCK_SIZE = 10 * 1024 * 1024
+
+# UTF-8 encodings of the sentence marks blocks are cut after (۔ and ؟, two bytes each)
+SENTENCE_END_MARKS = ("۔".encode("utf-8"), "؟".encode("utf-8"))
+
 # Make sure /processed directory exists
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-# === Step 2: Read the raw Sindhi text file ===
-with open(INPUT_FILE, "r", encoding="utf-8") as f:
-    text = f.read()
-
-# Normalize to NFC form to ensure jointed Sindhi script (important for cursive characters)
-text = unicodedata.normalize("NFC", text)
+# === Step 2: Load stopwords efficiently using a set ===
+# (Set lookup is O(1) — much faster than list). Loaded up front because the corpus is
+# filtered while it is streamed; only this set stays in memory for the whole run.
+with open(STOPWORDS_FILE, "r", encoding="utf-8") as f:
+    stopwords = set(line.strip() for line in f if line.strip())
 
 # === Step 3: Remove unwanted characters ===
 # ⛔️ Updated: Removed all digits (Western 0–9 and Arabic-Indic ٠–٩)
 # Keep only Sindhi (Arabic-based) script, spaces, and Sindhi punctuation marks
 # Unicode blocks: Arabic \u0600-\u06FF, Arabic Extended-A \u0750-\u077F, Extended-B \u08A0-\u08FF
 # Removed digits 0–9 (\u0030-\u0039) and Arabic-Indic digits (\u0660-\u0669)
-allowed_pattern = r"[\u0600-\u06FF\u0750-\u077F\u08A0-\u08FF\s۔؟]"
-
-# Replace disallowed characters with a space
-clean_text = "".join(ch if re.match(allowed_pattern, ch) else " " for ch in text)
-
-# === Step 4: Normalize whitespace ===
-clean_text = re.sub(r"\s+", " ", clean_text).strip()
-
-# === Step 5: Split text into sentences ===
-# First split by Sindhi punctuation marks
-sentences = re.split(r"[۔؟!]", clean_text)
-sentences = [s.strip() for s in sentences if s.strip()]
-
-# === Step 6: Further split long sentences by spaces ===
-def split_long_sentences(sentences, max_words=15):
-    """Split sentences that are too long into smaller chunks"""
-    split_sentences = []
-    for sentence in sentences:
-        words = sentence.split()
-        if len(words) <= max_words:
-            split_sentences.append(sentence)
-        else:
-            # Split into chunks of max_words
-            for i in range(0, len(words), max_words):
-                chunk = " ".join(words[i:i + max_words])
-                split_sentences.append(chunk)
-    return split_sentences
-
-# Apply sentence splitting
-processed_sentences = split_long_sentences(sentences, max_words=10)  # Adjust max_words as needed
-
-# === Step 7: Load stopwords efficiently using a set ===
-# (Set lookup is O(1) — much faster than list)
-with open(STOPWORDS_FILE, "r", encoding="utf-8") as f:
-    stopwords = set(line.strip() for line in f if line.strip())
-
-def remove_stopwords(sentence):
-    """Remove Sindhi stopwords from a single sentence."""
+# DISALLOWED_RE's negated class matches whole runs of disallowed characters in one C-level scan
+def clean_line(line):
+    """Normalize one line to NFC and replace disallowed characters with a space."""
+    # NFC keeps the Sindhi script jointed (important for cursive characters)
+    line = unicodedata.normalize("NFC", line)
+    return DISALLOWED_RE.sub(" ", line)
+
+# === Step 4: Split the streamed text into sentences ===
+def iter_sentences(lines):
+    """Yield whitespace-normalized sentences from an iterable of raw lines.
+
+    Sentences may span lines, so the text after the last Sindhi punctuation mark
+    of a line is carried over until the sentence is closed (or the input ends).
+    """
+    pending = []  # pieces of the sentence that is still open
+    for line in lines:
+        parts = SENTENCE_SPLIT_RE.split(clean_line(line))
+        pending.append(parts[0])
+        if len(parts) == 1:
+            continue
+        closed = ["".join(pending)] + parts[1:-1]
+        pending = [parts[-1]]
+        for sentence in closed:
+            # Collapse whitespace (newlines included) to single spaces; split() also
+            # drops the leading/trailing runs, so no separate strip is needed
+            sentence = " ".join(sentence.split())
+            if sentence:
+                yield sentence
+    sentence = " ".join("".join(pending).split())
+    if sentence:
+        yield sentence
+
+# === Step 5: Split long sentences and remove stopwords in one pass ===
+MAX_WORDS = 10  # Adjust max words per output line as needed
+
+def process_sentence(sentence, max_words=MAX_WORDS):
+    """Yield the cleaned output lines for one sentence.
+
+    The sentence is split into words once; each chunk of at most max_words words
+    has its Sindhi stopwords removed and is joined once. Chunks left empty by
+    stopword removal are dropped.
+    """
     words = sentence.split()  # Split by spaces (jointed script remains intact)
-    filtered = [w for w in words if w not in stopwords]
-    return " ".join(filtered)
-
-# === Step 8: Apply stopword removal ===
-processed_sentences = [remove_stopwords(s) for s in processed_sentences]
-
-# Remove any empty sentences after stopword removal
-processed_sentences = [s for s in processed_sentences if s.strip()]
-
-# === Step 9: Write cleaned text to output file ===
-with open(OUTPUT_FILE, "w", encoding="utf-8") as f:
-    for line in processed_sentences:
-        f.write(line + "\n")
-
-print("✅ Preprocessing complete!")
-print(f"Original sentences: {len(sentences)}")
-print(f"After splitting: {len(processed_sentences)}")
-print(f"Cleaned corpus saved at: {OUTPUT_FILE}")
\ No newline at end of file
+    for i in range(0, len(words), max_words):
+        # filterfalse calls the set's own __contains__, so the loop runs without Python bytecode
+        kept = " ".join(filterfalse(stopwords.__contains__, words[i:i + max_words]))
+        if kept:
+            yield kept
+
+# === Step 6: Process the corpus in sentence-aligned blocks across CPU cores ===
+def iter_block_ranges(mm, block_size=BLOCK_SIZE):
+    """Yield (start, end) byte offsets of blocks of about block_size bytes, each ending after a ۔ or ؟.
+
+    Cutting only at sentence marks keeps every sentence inside one block, so
+    blocks can be processed independently with the same result as one pass.
+    The marks are searched for as UTF-8 bytes (which never occur inside another
+    character's encoding), so the file is never decoded here.
+    """
+    size = len(mm)
+    start = 0
+    while start < size:
+        limit = start + block_size
+        if limit >= size:
+            end = size
+        else:
+            cut = max(mm.rfind(mark, start, limit) for mark in SENTENCE_END_MARKS)
+            if cut == -1:
+                # No sentence end yet; extend the block to the next one
+                found = [i for i in (mm.find(mark, limit) for mark in SENTENCE_END_MARKS) if i != -1]
+                cut = min(found) if found else -1
+            end = size if cut == -1 else cut + 2
+        yield start, end
+        start = end
+
+def process_range(span):
+    """Read and decode the (start, end) byte range of the input, then run process_block on it."""
+    start, end = span
+    with open(INPUT_FILE, "rb") as f:
+        f.seek(start)
+        return process_block(f.read(end - start).decode("utf-8"))
+
+def process_block(block):
+    """Run the full pipeline over one block; returns (cleaned text, sentences, output lines)."""
+    lines = []
+    sentence_count = 0
+    # Fed line by line: NFC only takes its slow path on the lines that need it
+    for sentence in iter_sentences(block.splitlines(keepends=True)):
+        sentence_count += 1
+        lines.extend(process_sentence(sentence))
+    return "".join(line + "\n" for line in lines), sentence_count, len(lines)
+
+def main():
+    """Stream the raw corpus through the pipeline and write the cleaned corpus."""
+    sentence_count = 0
+    output_count = 0
+    # Block boundaries are found on a read-only mapping of the file; each block is
+    # then read and decoded by whichever process handles it, so the parent never
+    # holds the decoded corpus or pickles text to the workers
+    ranges = []
+    if os.path.getsize(INPUT_FILE) > 0:  # an empty file cannot be mapped
+        with open(INPUT_FILE, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            ranges = list(iter_block_ranges(mm))
+    with open(OUTPUT_FILE, "w", encoding="utf-8", buffering=IO_BUFFER_SIZE) as out:
+        if len(ranges) <= 1:
+            # A single block: not worth starting worker processes
+            results = map(process_range, ranges)
+            pool = None
+        else:
+            # Workers inherit (fork) or reload (spawn) the stopword set; imap keeps output in corpus order
+            pool = Pool(min(os.cpu_count() or 1, len(ranges)))
+            results = pool.imap(process_range, ranges, chunksize=1)
+        try:
+            for cleaned, n_sentences, n_lines in results:
+                out.write(cleaned)
+                sentence_count += n_sentences
+                output_count += n_lines
+        finally:
+            if pool is not None:
+                pool.terminate()  # all results consumed (or an error raised); same as leaving `with Pool()`
+
+    print("✅ Preprocessing complete!")
+    print(f"Original sentences: {sentence_count}")
+    print(f"After splitting: {output_count}")
+    print(f"Cleaned corpus saved at: {OUTPUT_FILE}")
+
+if __name__ == "__main__":
+    main()
@@ -7,7 +7,8 @@ Generates visualization plots for Sindhi text analysis.
 Works with CSVs containing:
   • word           – disjointed token form
   • frequency      – count of the word
-  • word_prepared  – joined form (for display)
+  • word_prepared  – joined form (for display, optional; derived from
+                     `word` when absent)
 
 Creates:
   • Bar Plot (Top frequent words)
@@ -19,6 +20,16 @@ import os
 import argparse
 import pandas as pd
 import matplotlib.pyplot as plt
+import arabic_reshaper
+from bidi.algorithm import get_display
+
+# Resolution of saved plots; PNG encoding time and file size grow with its square
+DPI = 200
+
+
+def prepare_rtl_text(text):
+    """Reshape and reorder Arabic-script text for display."""
+    return get_display(arabic_reshaper.reshape(text))
 
 
 def visualize_sindhi_corpus(freq_file, out_dir, font_path=None):
@@ -26,13 +37,21 @@ def visualize_sindhi_corpus(freq_file, out_dir, font_path=None):
     if not os.path.exists(freq_file):
         raise FileNotFoundError(f"❌ Frequency file not found: {freq_file}")
 
-    df = pd.read_csv(freq_file)
-    expected_cols = {"word", "frequency", "word_prepared"}
+    # Parse only the columns used below (the analyzer's CSV also carries a rank column)
+    df = pd.read_csv(
+        freq_file,
+        usecols=lambda col: col in {"word", "frequency", "word_prepared"},
+        dtype={"frequency": "int64"},
+    )
+    expected_cols = {"word", "frequency"}
     if not expected_cols.issubset(df.columns):
         raise ValueError(f"❌ CSV must contain columns: {expected_cols}")
+    if "word_prepared" not in df.columns:
+        # Lengths and labels use the joined (display) form, so derive it when absent
+        df["word_prepared"] = df["word"].astype(str).map(prepare_rtl_text)
 
     # --- Compute lengths ---
-    df["length"] = df["word_prepared"].astype(str).apply(len)
+    df["length"] = df["word_prepared"].astype(str).str.len()
 
     # --- Font Setup ---
     if font_path and os.path.exists(font_path):
@@ -45,42 +64,45 @@ def visualize_sindhi_corpus(freq_file, out_dir, font_path=None):
     plt.rcParams["axes.unicode_minus"] = False
     os.makedirs(out_dir, exist_ok=True)
 
+    # One figure is reused for every plot: cleared and resized instead of rebuilt
+    fig, ax = plt.subplots()
+
     # --- BAR PLOT (Top 20) ---
-    plt.figure(figsize=(10, 6))
+    fig.set_size_inches(10, 6)
     top20 = df.nlargest(20, "frequency")
-    plt.barh(top20["word_prepared"], top20["frequency"], color="teal")
-    plt.gca().invert_yaxis()
-    plt.title("🔥 Top 20 Most Frequent Sindhi Words (Joined Form)")
-    plt.xlabel("Frequency")
-    plt.tight_layout()
+    ax.barh(top20["word_prepared"], top20["frequency"], color="teal")
+    ax.invert_yaxis()
+    ax.set_title("🔥 Top 20 Most Frequent Sindhi Words (Joined Form)")
+    ax.set_xlabel("Frequency")
+    fig.tight_layout()
     bar_path = os.path.join(out_dir, "barplot_top20.png")
-    plt.savefig(bar_path, dpi=300)
-    plt.close()
+    fig.savefig(bar_path, dpi=DPI)
     print(f"✅ Saved: {bar_path}")
 
     # --- BOX PLOT (Word Lengths) ---
-    plt.figure(figsize=(6, 6))
-    plt.boxplot(df["length"], patch_artist=True, boxprops=dict(facecolor="skyblue"))
-    plt.title("📦 Word Length Distribution (Based on Joined Words)")
-    plt.ylabel("Length of Words")
-    plt.tight_layout()
+    ax.clear()
+    fig.set_size_inches(6, 6)
+    ax.boxplot(df["length"], patch_artist=True, boxprops=dict(facecolor="skyblue"))
+    ax.set_title("📦 Word Length Distribution (Based on Joined Words)")
+    ax.set_ylabel("Length of Words")
+    fig.tight_layout()
     box_path = os.path.join(out_dir, "boxplot_word_length.png")
-    plt.savefig(box_path, dpi=300)
-    plt.close()
+    fig.savefig(box_path, dpi=DPI)
     print(f"✅ Saved: {box_path}")
 
     # --- SCATTER PLOT (Freq vs Length) ---
-    plt.figure(figsize=(8, 6))
-    plt.scatter(df["length"], df["frequency"], alpha=0.6, color="purple", edgecolors="w")
-    plt.title("⚪ Frequency vs Word Length (Sindhi Corpus)")
-    plt.xlabel("Word Length (Joined Form)")
-    plt.ylabel("Frequency")
-    plt.tight_layout()
+    ax.clear()
+    fig.set_size_inches(8, 6)
+    ax.scatter(df["length"], df["frequency"], alpha=0.6, color="purple", edgecolors="w")
+    ax.set_title("⚪ Frequency vs Word Length (Sindhi Corpus)")
+    ax.set_xlabel("Word Length (Joined Form)")
+    ax.set_ylabel("Frequency")
+    fig.tight_layout()
     scatter_path = os.path.join(out_dir, "scatter_freq_length.png")
-    plt.savefig(scatter_path, dpi=300)
-    plt.close()
+    fig.savefig(scatter_path, dpi=DPI)
     print(f"✅ Saved: {scatter_path}")
 
+    plt.close(fig)
     print("\n🎉 Visualization complete! Check:", out_dir)
 
 